@@ -4,11 +4,16 @@
 
 import re
 import textwrap
+from collections import deque
 from datetime import datetime, date
+from functools import lru_cache
 
 ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
-def strip_ansi(s): return ANSI_RE.sub("", s)
+def strip_ansi(s):
+    s=str(s)
+    return ANSI_RE.sub("", s) if "\x1b" in s else s
 
+@lru_cache(maxsize=128)
 def normalize_date_format(fmt: str) -> str:
     mapping = {
         "yyyy": "%Y","yy": "%y","mm": "%m","dd": "%d",
@@ -24,32 +29,56 @@ def parse_bool(value):
     if v in ("false","no","0"): return False
     return value
 
-def format_cell(value, coldef):
-    ctype=coldef.get("type","str")
+# Cell formatters: one handler per column type, taking (value, fmt).
+# fmt is unused by str/bool/int and optional elsewhere, so a handler
+# doubles as a one-argument formatter for columns without a format
+
+def _fmt_str(value, fmt=None):
+    return str(value)
+
+def _fmt_bool(value, fmt=None):
+    v=parse_bool(value)
+    return "true" if v is True else "false" if v is False else str(value)
+
+def _fmt_int(value, fmt=None):
+    try: return str(int(value))
+    except: return str(value)
+
+def _fmt_float(value, fmt=None):
+    try:
+        f=float(value)
+        return format(f,fmt) if fmt else f"{f:g}"
+    except:
+        return str(value)
+
+def _fmt_date(value, fmt=None):
+    try: d=datetime.fromisoformat(str(value)).date()
+    except: return str(value)
+    return d.strftime(normalize_date_format(fmt)) if fmt else d.isoformat()
+
+def _fmt_datetime(value, fmt=None):
+    try: dt=datetime.fromisoformat(str(value))
+    except: return str(value)
+    return dt.strftime(normalize_date_format(fmt)) if fmt else dt.strftime("%Y-%m-%d %H:%M:%S")
+
+_HANDLERS={
+    "str":_fmt_str,"bool":_fmt_bool,"int":_fmt_int,
+    "float":_fmt_float,"date":_fmt_date,"datetime":_fmt_datetime,
+}
+
+def _make_formatter(coldef):
+    # resolve type and format once per column; the result is called per cell
+    handler=_HANDLERS.get(coldef.get("type","str"),_fmt_str)
     fmt=coldef.get("format")
+    if handler is _fmt_str: return str
+    if not fmt or handler is _fmt_bool or handler is _fmt_int: return handler
+    def fmt_cell(value): return handler(value,fmt)
+    return fmt_cell
 
+def format_cell(value, coldef):
+    ctype=coldef.get("type","str")
     if ctype=="str": return str(value)
-    if ctype=="bool":
-        v=parse_bool(value)
-        return "true" if v is True else "false" if v is False else str(value)
-    if ctype=="int":
-        try: return str(int(value))
-        except: return str(value)
-    if ctype=="float":
-        try:
-            f=float(value)
-            return format(f,fmt) if fmt else f"{f:g}"
-        except:
-            return str(value)
-    if ctype=="date":
-        try: d=datetime.fromisoformat(str(value)).date()
-        except: return str(value)
-        return d.strftime(normalize_date_format(fmt)) if fmt else d.isoformat()
-    if ctype=="datetime":
-        try: dt=datetime.fromisoformat(str(value))
-        except: return str(value)
-        return dt.strftime(normalize_date_format(fmt)) if fmt else dt.strftime("%Y-%m-%d %H:%M:%S")
-    return str(value)
+    return _HANDLERS.get(ctype,_fmt_str)(value,coldef.get("format"))
 
 def build_tree(paths,sep):
     tree={}
@@ -59,38 +88,54 @@ def build_tree(paths,sep):
         for p in parts: node=node.setdefault(p,{})
     return tree
 
-def flatten_tree(tree,level=0,prefix=""):
-    out=[]
-    for key in sorted(tree.keys()):
-        full=prefix+key if prefix=="" else prefix+"/"+key
-        children=tree[key]
-        is_leaf=(len(children)==0)
-        out.append((full,key,level,is_leaf))
-        out.extend(flatten_tree(children,level+1,full))
+def _tree_entries(tree,level,prefix):
+    # reversed so that popping from the right yields keys in ascending order
+    for key in sorted(tree.keys(),reverse=True):
+        yield (prefix+key if prefix=="" else prefix+"/"+key),key,level,tree[key]
+
+def flatten_tree(tree,level=0,prefix="",out=None):
+    # entries are appended in place to a single accumulator (``out`` if given)
+    if out is None: out=[]
+    emit=out.append
+    stack=deque(_tree_entries(tree,level,prefix))
+    pop,push=stack.pop,stack.extend
+    while stack:
+        full,key,lvl,children=pop()
+        if not children:
+            # leaves are most nodes: no key sort, no entries generator
+            emit((full,key,lvl,True))
+            continue
+        emit((full,key,lvl,False))
+        push(_tree_entries(children,lvl+1,full))
     return out
 
-def apply_hierarchy(headers,rows):
-    for idx,h in enumerate(headers):
-        if "hierarchy" not in h: continue
-        sep=h["hierarchy"].get("sep","/")
-        original=[r[idx] for r in rows]
-        mapvals={r[idx]: r[1:] for r in rows}
-        tree=build_tree(original,sep)
-        tri=flatten_tree(tree)
-        other=len(rows[0])-1
-        new=[]
-        for full,label,lvl,is_leaf in tri:
-            values=mapvals[full] if is_leaf and full in mapvals else [""]*other
-            new.append(["  "*lvl+label]+values)
-        return new
-    return rows
+def hierarchy_index(headers):
+    return next((i for i,h in enumerate(headers) if "hierarchy" in h),None)
+
+def apply_hierarchy(headers,rows,idx=None):
+    if idx is None: idx=hierarchy_index(headers)
+    if idx is None: return rows
+    sep=headers[idx]["hierarchy"].get("sep","/")
+    # one pass over rows: the mapping's keys are the distinct paths
+    mapvals={r[idx]: r[1:] for r in rows}
+    tri=flatten_tree(build_tree(mapvals,sep))
+    other=len(rows[0])-1
+    new=[]
+    for full,label,lvl,is_leaf in tri:
+        values=mapvals[full] if is_leaf and full in mapvals else [""]*other
+        new.append(["  "*lvl+label]+values)
+    return new
 
 def compute_col_widths(names,rows,max_width=120,minw=6,pad=1):
     usable=max_width-(len(names)+1)
     widths=[]
-    for i,n in enumerate(names):
-        m=len(strip_ansi(n))
-        for r in rows: m=max(m,len(strip_ansi(str(r[i]))))
+    cols=list(zip(*rows)) if rows else [()]*len(names)
+    # zip() stops at the shortest row: refuse to drop columns silently
+    if len(cols)<len(names): raise IndexError("table row has fewer cells than headers")
+    for n,col in zip(names,cols):
+        col=list(map(str,col))
+        if any("\x1b" in c for c in col): col=list(map(strip_ansi,col))
+        m=max(len(strip_ansi(n)),max(map(len,col),default=0))
         widths.append(max(m+pad,minw))
     total=sum(widths)
     if total>usable:
@@ -99,38 +144,50 @@ def compute_col_widths(names,rows,max_width=120,minw=6,pad=1):
     return widths
 
 def wrap_row(row,widths):
-    return [textwrap.wrap(str(c),w) or [""] for c,w in zip(row,widths)]
+    out=[]
+    for c,w in zip(row,widths):
+        s=c if isinstance(c,str) else str(c)
+        # textwrap would return such a cell unchanged: it fits, and holds no
+        # whitespace other than inner spaces (isprintable() rejects the rest)
+        if len(s)<=w and s.isprintable() and s[-1:]!=" ": out.append([s])
+        else: out.append(textwrap.wrap(s,w) or [""])
+    return out
 
 def merge_wrapped(wrapped):
-    ml=max(len(col) for col in wrapped)
+    ml=max(map(len,wrapped))
+    if ml==1: return [[col[0] if col else "" for col in wrapped]]
     return [[col[i] if i<len(col) else "" for col in wrapped] for i in range(ml)]
 
+_ALIGN_FNS={"right":str.rjust,"center":str.center,"left":str.ljust}
+
 def apply_align(t,w,align):
-    if align=="right": return t.rjust(w)
-    if align=="center": return t.center(w)
-    return t.ljust(w)
+    if len(t)>=w: return t
+    return _ALIGN_FNS.get(align,str.ljust)(t,w)
 
 def draw_table(headers,rows,max_width=120):
-    names=[h["name"] for h in headers]
+    names=tuple(h["name"] for h in headers)
     widths=compute_col_widths(names,rows,max_width)
-    def sep(): return "+"+ "+".join("-"*w for w in widths) +"+"
-    out=[sep()]
+    aligns=tuple(_ALIGN_FNS.get(h.get("align","left"),str.ljust) for h in headers)
+    line_sep="+"+ "+".join("-"*w for w in widths) +"+"
+    out=[line_sep]
+    emit=out.append
+    # join() materializes its input anyway: hand it a list, not a generator
     for line in merge_wrapped(wrap_row(names,widths)):
-        out.append("|"+"|".join(apply_align(txt,w,h.get("align","left"))
-                                 for txt,w,h in zip(line,widths,headers))+"|")
-    out.append(sep())
+        emit("|"+"|".join([a(txt,w) for txt,w,a in zip(line,widths,aligns)])+"|")
+    emit(line_sep)
     for row in rows:
         for line in merge_wrapped(wrap_row(row,widths)):
-            out.append("|"+"|".join(apply_align(txt,w,h.get("align","left"))
-                                     for txt,w,h in zip(line,widths,headers))+"|")
-        out.append(sep())
+            emit("|"+"|".join([a(txt,w) for txt,w,a in zip(line,widths,aligns)])+"|")
+        emit(line_sep)
     return "\n".join(out)
 
 def render_ascii_table(data,max_width=None):
     headers=data["headers"]; rows=data["rows"]
     if max_width is None: max_width=data.get("max_width",120)
-    formatted=[[format_cell(c,h) for c,h in zip(r,headers)] for r in rows]
-    final=apply_hierarchy(headers,formatted)
+    fmts=[_make_formatter(h) for h in headers]
+    formatted=[[f(c) for f,c in zip(fmts,r)] for r in rows]
+    idx=hierarchy_index(headers)
+    final=formatted if idx is None else apply_hierarchy(headers,formatted,idx)
     table=draw_table(headers,final,max_width=max_width)
     title=data.get("title")
     return title.center(max_width)+"\n"+table if title else table
@@ -138,10 +195,11 @@ def render_ascii_table(data,max_width=None):
 def render_markdown_table(data):
     headers=data["headers"]; rows=data["rows"]
     names=[h["name"] for h in headers]
+    fmts=[_make_formatter(h) for h in headers]
     out=[]
     out.append("| "+ " | ".join(names)+" |")
     out.append("| "+ " | ".join("---" for _ in names)+" |")
     for r in rows:
-        vals=[format_cell(c,h) for c,h in zip(r,headers)]
+        vals=[f(c) for f,c in zip(fmts,r)]
         out.append("| "+ " | ".join(vals)+" |")
     return "\n".join(out)
@@ -4,11 +4,12 @@ Decorators for SmartSeeds.
 Provides utilities for extracting and grouping keyword arguments.
 """
 
+import sys
 from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar
 
-from .dict_utils import dictExtract
+from .dict_utils import _RESERVED_NAMES
 
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -63,52 +64,48 @@ def extract_kwargs(
     specs_to_use = _dictkwargs if _dictkwargs is not None else extraction_specs
 
     def decorator(func: F) -> F:
+        # Resolve every extraction spec once, at decoration time:
+        # (grp_key, prefix, slice_prefix, pop) per extraction key
+        compiled = tuple(
+            _compile_extract_spec(extract_key, extract_value)
+            for extract_key, extract_value in specs_to_use.items()
+        )
+        # partials and callable instances have no __name__
+        fname = getattr(func, "__name__", "")
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Check if this is a method (has self) or function
-            # For methods: self is args[0]
-            # For functions: no self
-            has_self = len(args) > 0 and hasattr(args[0].__class__, func.__name__)
-            self_arg = args[0] if has_self else None
-
             # Call adapter if specified and this is a method
-            if _adapter and self_arg is not None:
-                adapter_method = getattr(self_arg, _adapter, None)
+            # For methods: self is args[0]; probed only when there is an adapter
+            if _adapter and args and hasattr(type(args[0]), fname):
+                adapter_method = getattr(args[0], _adapter, None)
                 if adapter_method is not None:
                     adapter_method(kwargs)
 
-            # Process each extraction specification
-            for extract_key, extract_value in specs_to_use.items():
-                grp_key = f"{extract_key}_kwargs"
-
-                # Get existing grouped kwargs (if explicitly passed)
+            # Get existing grouped kwargs (if explicitly passed)
+            # A non-dict value (edge case) is replaced by an empty dict
+            groups = []
+            for grp_key, _prefix, _slice, _pop in compiled:
                 current = kwargs.pop(grp_key, None)
-                if current is None:
-                    current = {}
-                elif not isinstance(current, dict):
-                    # Edge case: someone passed non-dict, convert to dict
-                    current = {}
-
-                # Determine extraction options based on extract_value
-                if extract_value is True:
-                    # True means: extract and remove from source
-                    extract_options = _POP_EXTRACT_OPTIONS
-                elif isinstance(extract_value, dict):
-                    # Dict means: custom options
-                    extract_options = {**_DEFAULT_EXTRACT_OPTIONS, **extract_value}
-                else:
-                    # Default: extract but don't remove from source
-                    extract_options = _DEFAULT_EXTRACT_OPTIONS
-
-                # Extract prefixed kwargs
-                prefix = f"{extract_key}_"
-                extracted = dictExtract(kwargs, prefix, **extract_options)
-
-                # Merge extracted kwargs with current
-                current.update(extracted)
-
-                # Set the grouped kwargs back
-                # Always set as dict (never None), matching original behavior
+                groups.append(current if isinstance(current, dict) else {})
+
+            # Single pass over kwargs: each key goes to every matching prefix,
+            # in spec order, until a popping spec consumes it
+            for key in list(kwargs):
+                for current, (_grp_key, prefix, slice_prefix, pop) in zip(groups, compiled):
+                    # Prefixes are never empty, so a changed key means a match
+                    stripped = key.removeprefix(prefix)
+                    if stripped != key:
+                        name = stripped if slice_prefix else key
+                        name = _RESERVED_NAMES.get(name, name)
+                        if pop:
+                            current[name] = kwargs.pop(key)
+                            break
+                        current[name] = kwargs[key]
+
+            # Set the grouped kwargs back
+            # Always set as dict (never None), matching original behavior
+            for current, (grp_key, _prefix, _slice, _pop) in zip(groups, compiled):
                 kwargs[grp_key] = current
 
             return func(*args, **kwargs)
@@ -117,3 +114,19 @@ def extract_kwargs(
 
     return decorator
 
+
+def _compile_extract_spec(extract_key: str, extract_value: Any) -> tuple[str, str, bool, bool]:
+    """Turn one extraction spec into ``(grp_key, prefix, slice_prefix, pop)``."""
+    if extract_value is True:
+        # True means: extract and remove from source
+        extract_options = _POP_EXTRACT_OPTIONS
+    elif isinstance(extract_value, dict):
+        # Dict means: custom options
+        extract_options = {**_DEFAULT_EXTRACT_OPTIONS, **extract_value}
+    else:
+        # Default: extract but don't remove from source
+        extract_options = _DEFAULT_EXTRACT_OPTIONS
+    # Interned: these strings are compared and used as kwargs keys on every call
+    prefix = sys.intern(f"{extract_key}_")
+    grp_key = sys.intern(f"{extract_key}_kwargs")
+    return grp_key, prefix, bool(extract_options["slice_prefix"]), bool(extract_options["pop"])
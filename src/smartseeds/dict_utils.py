@@ -21,10 +21,11 @@ def filtered_dict(
         filter_fn: Optional callable receiving ``(key, value)`` and returning
             True if the pair should be kept. When None, the mapping is copied.
     """
-    if not data:
+    if data is None:
         return {}
     if filter_fn is None:
-        return dict(data)
+        # dict.copy() clones the hash table directly; other mappings go through dict()
+        return data.copy() if type(data) is dict else dict(data)
     return {k: v for k, v in data.items() if filter_fn(k, v)}
 
 
@@ -60,9 +61,14 @@ def _merge_kwargs(
     ignore_empty: bool = False,
 ) -> dict[str, Any]:
     combined_filter = _compose_filter(filter_fn, ignore_none, ignore_empty)
-    merged_defaults = dict(defaults or {})
-    filtered_incoming = filtered_dict(incoming, combined_filter)
-    return merged_defaults | filtered_incoming
+    # Update the defaults copy in place: no intermediate dicts for an empty
+    # mapping, the unfiltered incoming values or the ``|`` merge
+    merged = dict(defaults) if defaults else {}
+    if incoming:
+        merged.update(
+            incoming if combined_filter is None else filtered_dict(incoming, combined_filter)
+        )
+    return merged
 
 
 def _compose_filter(
@@ -70,27 +76,41 @@ def _compose_filter(
     ignore_none: bool,
     ignore_empty: bool,
 ) -> Callable[[str, Any], bool] | None:
-    if not (filter_fn or ignore_none or ignore_empty):
-        return None
+    # Flag checks are resolved here, once per call: the returned predicate
+    # only tests what was asked for, and a lone filter_fn is used as-is
+    flag_filter = _FLAG_FILTERS[bool(ignore_none), bool(ignore_empty)]
+    if filter_fn is None or flag_filter is None:
+        return filter_fn or flag_filter
 
     def predicate(key: str, value: Any) -> bool:
-        if ignore_none and value is None:
-            return False
-        if ignore_empty and _is_empty_value(value):
-            return False
-        if filter_fn and not filter_fn(key, value):
-            return False
-        return True
+        return flag_filter(key, value) and bool(filter_fn(key, value))
 
     return predicate
 
 
-def _is_empty_value(value: Any) -> bool:
-    """Return True for values considered 'empty'."""
-    empty_sequences = (str, bytes, list, tuple, dict, set, frozenset)
-    if isinstance(value, empty_sequences):
-        return len(value) == 0
-    return False
+# Values of these types are considered 'empty' when their length is zero
+_EMPTY_SEQUENCES = (str, bytes, list, tuple, dict, set, frozenset)
+
+
+def _keep_not_none(key: str, value: Any) -> bool:
+    return value is not None
+
+
+def _keep_not_empty(key: str, value: Any) -> bool:
+    return not (isinstance(value, _EMPTY_SEQUENCES) and len(value) == 0)
+
+
+def _keep_not_none_not_empty(key: str, value: Any) -> bool:
+    return value is not None and not (isinstance(value, _EMPTY_SEQUENCES) and len(value) == 0)
+
+
+# (ignore_none, ignore_empty) -> specialized predicate
+_FLAG_FILTERS: dict[tuple[bool, bool], Callable[[str, Any], bool] | None] = {
+    (False, False): None,
+    (True, False): _keep_not_none,
+    (False, True): _keep_not_empty,
+    (True, True): _keep_not_none_not_empty,
+}
 
 
 class SmartOptions(SimpleNamespace):
@@ -120,27 +140,24 @@ class SmartOptions(SimpleNamespace):
             ignore_none=ignore_none,
             ignore_empty=ignore_empty,
         )
-        object.__setattr__(self, "_data", dict(merged))
+        # The namespace __dict__ is the only store: plain attribute access,
+        # no mirror dict to keep in sync on every set/delete
         super().__init__(**merged)
 
     def as_dict(self) -> dict[str, Any]:
         """Return a copy of current options."""
-        return dict(self._data)
-
-    def __setattr__(self, key: str, value: Any):
-        if key == "_data":
-            object.__setattr__(self, key, value)
-            return
-        self._data[key] = value
-        super().__setattr__(key, value)
+        return self.__dict__.copy()
 
     def __delattr__(self, key: str):
         if key == "_data":
             raise AttributeError("_data attribute cannot be removed")
-        self._data.pop(key, None)
         super().__delattr__(key)
 
 
+# Extracted keys that would clash with Python keywords
+_RESERVED_NAMES = {"class": "_class"}
+
+
 def dictExtract(mydict, prefix, pop=False, slice_prefix=True, is_list=False):
     """Return a dict of the items with keys starting with prefix.
 
@@ -154,13 +171,14 @@ def dictExtract(mydict, prefix, pop=False, slice_prefix=True, is_list=False):
     # FIXME: the is_list parameter is never used.
 
     lprefix = len(prefix) if slice_prefix else 0
-
-    cb = mydict.pop if pop else mydict.get
-    reserved_names = ["class"]
-    return dict(
-        [
-            (k[lprefix:] if k[lprefix:] not in reserved_names else f"_{k[lprefix:]}", cb(k))
-            for k in list(mydict.keys())
-            if k.startswith(prefix)
-        ]
-    )
+    reserved = _RESERVED_NAMES
+
+    if pop:
+        # Collect matches first: the source cannot shrink while iterating it
+        matched = [k for k in mydict if k.startswith(prefix)]
+        return {reserved.get(k[lprefix:], k[lprefix:]): mydict.pop(k) for k in matched}
+    return {
+        reserved.get(k[lprefix:], k[lprefix:]): v
+        for k, v in mydict.items()
+        if k.startswith(prefix)
+    }
@@ -12,6 +12,7 @@ from smartseeds.ascii_table import (
     build_tree,
     flatten_tree,
     apply_hierarchy,
+    hierarchy_index,
     compute_col_widths,
     wrap_row,
     merge_wrapped,
@@ -37,6 +38,10 @@ class TestStripAnsi:
         text = "\x1b[1m\x1b[31mBold Red\x1b[0m\x1b[32mGreen\x1b[0m"
         assert strip_ansi(text) == "Bold RedGreen"
 
+    def test_strip_ansi_converts_non_strings(self):
+        """Non-string values are converted before stripping."""
+        assert strip_ansi(42) == "42"
+
 
 class TestNormalizeDateFormat:
     """Test date format normalization."""
@@ -190,6 +195,28 @@ class TestTreeOperations:
         assert flat[2] == ("a/b/c", "c", 2, True)
         assert flat[3] == ("a/d", "d", 1, True)
 
+    def test_flatten_tree_sorts_siblings(self):
+        """Siblings come out in key order regardless of insertion order."""
+        tree = {"b": {"y": {}, "x": {}}, "a": {}}
+        assert [full for full, *_ in flatten_tree(tree)] == ["a", "b", "b/x", "b/y"]
+
+    def test_flatten_tree_appends_to_accumulator(self):
+        """An existing list can be passed in and is extended in place."""
+        acc = [("x", "x", 0, True)]
+        result = flatten_tree({"a": {}}, out=acc)
+        assert result is acc
+        assert acc == [("x", "x", 0, True), ("a", "a", 0, True)]
+
+    def test_flatten_tree_deep_hierarchy(self):
+        """Deep trees flatten without hitting the recursion limit."""
+        tree = node = {}
+        for _ in range(5000):
+            node = node.setdefault("n", {})
+        flat = flatten_tree(tree)
+        assert len(flat) == 5000
+        assert flat[-1][2] == 4999
+        assert flat[-1][3] is True
+
     def test_apply_hierarchy_simple(self):
         """Apply hierarchy with indentation."""
         headers = [
@@ -214,6 +241,11 @@ class TestTreeOperations:
         result = apply_hierarchy(headers, rows)
         assert result == rows
 
+    def test_hierarchy_index(self):
+        """Locate the first hierarchy column, or None."""
+        assert hierarchy_index([{"name": "A"}, {"name": "B", "hierarchy": {}}]) == 1
+        assert hierarchy_index([{"name": "A"}]) is None
+
 
 class TestTableLayout:
     """Test table layout calculations."""
@@ -242,6 +274,24 @@ class TestTableLayout:
         # Width should be based on "Red" (3 chars) not including ANSI codes
         assert widths[0] >= 3
 
+    def test_compute_col_widths_without_rows(self):
+        """Header names alone drive the widths of an empty table."""
+        widths = compute_col_widths(["Identifier", "B"], [])
+        assert widths == [len("Identifier") + 1, 6]
+
+    def test_compute_col_widths_rejects_short_rows(self):
+        """A row with fewer cells than headers is an error, not a dropped column."""
+        with pytest.raises(IndexError):
+            compute_col_widths(["A", "B"], [["1", "2"], ["3"]])
+        with pytest.raises(IndexError):
+            compute_col_widths(["A"], [[], ["a very long cell value"]])
+
+    def test_render_ascii_table_rejects_ragged_rows(self):
+        """Ragged rows don't silently lose columns in the rendered table."""
+        data = {"headers": [{"name": "A"}, {"name": "B"}], "rows": [["1", "2"], ["3"]]}
+        with pytest.raises(IndexError):
+            render_ascii_table(data)
+
     def test_wrap_row(self):
         """Wrap row content to specified widths."""
         row = ["short", "this is a longer text that needs wrapping"]
@@ -251,6 +301,18 @@ class TestTableLayout:
         assert isinstance(wrapped[0], list)
         assert isinstance(wrapped[1], list)
 
+    def test_wrap_row_matches_textwrap_for_short_cells(self):
+        """Cells that fit keep textwrap's whitespace handling."""
+        row = ["  indented", "trail  ", "tab\there", "   ", "", 42]
+        assert wrap_row(row, [16] * 6) == [
+            ["  indented"],
+            ["trail"],
+            ["tab     here"],
+            [""],
+            [""],
+            ["42"],
+        ]
+
     def test_merge_wrapped(self):
         """Merge wrapped columns into rows."""
         wrapped = [["a1", "a2"], ["b1"], ["c1", "c2", "c3"]]
@@ -260,6 +322,11 @@ class TestTableLayout:
         assert merged[1] == ["a2", "", "c2"]
         assert merged[2] == ["", "", "c3"]
 
+    def test_merge_wrapped_pads_empty_columns(self):
+        """Empty columns (textwrap gives [] for empty text) become blank cells."""
+        assert merge_wrapped([["a"], []]) == [["a", ""]]
+        assert merge_wrapped([[], ["b1", "b2"]]) == [["", "b1"], ["", "b2"]]
+
     def test_apply_align_left(self):
         """Left alignment."""
         assert apply_align("foo", 10, "left") == "foo       "
@@ -274,6 +341,15 @@ class TestTableLayout:
         assert result.strip() == "foo"
         assert len(result) == 10
 
+    def test_apply_align_full_width_is_unchanged(self):
+        """Text already at (or past) the width is returned as-is."""
+        assert apply_align("foobar", 6, "center") == "foobar"
+        assert apply_align("foobarbaz", 6, "right") == "foobarbaz"
+
+    def test_apply_align_unknown_defaults_to_left(self):
+        """Unknown alignment values fall back to left alignment."""
+        assert apply_align("foo", 6, "justify") == "foo   "
+
 
 class TestDrawTable:
     """Test ASCII table drawing."""
@@ -1,6 +1,8 @@
 """Tests for extract_kwargs decorator."""
 
 import pytest
+from functools import partial
+
 from smartseeds import extract_kwargs
 
 
@@ -169,6 +171,38 @@ class TestExtractKwargsBasic:
         assert result["logging"] == {"level": "INFO"}
         assert result["remaining"] == {"logging_level": "INFO", "other": "value"}
 
+    def test_overlapping_prefixes_follow_spec_order(self):
+        """A non-popping spec leaves keys for later specs; a popping one consumes them."""
+
+        @extract_kwargs(db={'pop': False}, db_pool=True, cache=True)
+        def func(db_kwargs=None, db_pool_kwargs=None, cache_kwargs=None, **kwargs):
+            return db_kwargs, db_pool_kwargs, kwargs
+
+        db, pool, rest = func(db_pool_size=5, db_name="main", cache_ttl=1)
+
+        assert db == {"pool_size": 5, "name": "main"}
+        assert pool == {"size": 5}
+        assert rest == {"db_name": "main"}
+
+    def test_overlapping_prefixes_keep_explicit_group_dicts(self):
+        """An explicit ``*_kwargs`` dict goes to its own group, not to an overlapping prefix."""
+
+        @extract_kwargs(db=True, db_pool=True)
+        def func(db_kwargs=None, db_pool_kwargs=None, **kwargs):
+            return db_kwargs, db_pool_kwargs, kwargs
+
+        db, pool, rest = func(db_pool_kwargs={"size": 5}, db_name="main")
+
+        assert db == {"name": "main"}
+        assert pool == {"size": 5}
+        assert rest == {}
+
+        @extract_kwargs(a_b_c=True, a_b=True)
+        def func2(a_b_c_kwargs=None, a_b_kwargs=None):
+            return a_b_c_kwargs, a_b_kwargs
+
+        assert func2(a_b_kwargs={"x": 1}, a_b_c_y=2) == ({"y": 2}, {"x": 1})
+
 
 class TestExtractKwargsAdapter:
     """Test _adapter functionality."""
@@ -213,3 +247,54 @@ class TestExtractKwargsAdapter:
         result = obj.my_method(name="test", logging_level="INFO")
 
         assert result["logging"] == {"level": "INFO"}
+
+    def test_adapter_ignored_for_plain_functions(self):
+        """A standalone function never has its first argument treated as self."""
+
+        class Holder:
+            def my_adapter(self, kwargs):
+                raise AssertionError("adapter must not run for plain functions")
+
+        @extract_kwargs(_adapter='my_adapter', logging=True)
+        def func(first, logging_kwargs=None, **kwargs):
+            return logging_kwargs
+
+        assert func(Holder(), logging_level="INFO") == {"level": "INFO"}
+
+    def test_adapter_skipped_for_classmethods(self):
+        """On a classmethod args[0] is the class, so the adapter is not called."""
+
+        class WithClassMethod:
+            def my_adapter(self, kwargs):
+                raise AssertionError("adapter must not run for classmethods")
+
+            @classmethod
+            @extract_kwargs(_adapter='my_adapter', logging=True)
+            def build(cls, logging_kwargs=None, **kwargs):
+                return logging_kwargs
+
+        assert WithClassMethod.build(logging_level="INFO") == {"level": "INFO"}
+
+    def test_adapter_called_for_method_assigned_after_class_creation(self):
+        """Functions attached to a class later still get the adapter."""
+
+        class Late:
+            def my_adapter(self, kwargs):
+                kwargs['logging_extra'] = 1
+
+        def handler(self, logging_kwargs=None, **kwargs):
+            return logging_kwargs
+
+        Late.handler = extract_kwargs(_adapter='my_adapter', logging=True)(handler)
+
+        assert Late().handler(logging_level="INFO") == {"level": "INFO", "extra": 1}
+
+    def test_decorating_partial(self):
+        """Callables without __name__ or __qualname__ can be decorated."""
+
+        def target(scale, logging_kwargs=None, **kwargs):
+            return scale, logging_kwargs
+
+        func = extract_kwargs(_adapter='my_adapter', logging=True)(partial(target, 2))
+
+        assert func(logging_level="INFO") == (2, {"level": "INFO"})
@@ -2,7 +2,7 @@
 
 import pytest
 from smartseeds import SmartOptions
-from smartseeds.dict_utils import filtered_dict, make_opts
+from smartseeds.dict_utils import dictExtract, filtered_dict, make_opts
 
 
 class TestFilteredDict:
@@ -14,6 +14,13 @@ class TestFilteredDict:
         assert result == source
         assert result is not source
 
+    def test_copies_non_dict_mappings_to_dict(self):
+        from types import MappingProxyType
+
+        result = filtered_dict(MappingProxyType({"a": 1}))
+        assert type(result) is dict
+        assert result == {"a": 1}
+
     def test_filters_none_values(self):
         source = {"a": 1, "b": None, "c": 3}
         result = filtered_dict(source, lambda key, value: value is not None)
@@ -22,6 +29,28 @@ class TestFilteredDict:
     def test_handles_none_source(self):
         assert filtered_dict(None) == {}
 
+    def test_empty_source_returns_new_dict(self):
+        source = {}
+        result = filtered_dict(source, lambda key, value: True)
+        assert result == {}
+        assert result is not source
+
+
+class TestDictExtract:
+    """Tests for dictExtract helper."""
+
+    def test_extract_without_pop_keeps_source(self):
+        source = {"log_level": "INFO", "log_class": "X", "timeout": 3}
+        result = dictExtract(source, "log_")
+        assert result == {"level": "INFO", "_class": "X"}
+        assert source == {"log_level": "INFO", "log_class": "X", "timeout": 3}
+
+    def test_extract_with_pop_removes_from_source(self):
+        source = {"log_level": "INFO", "timeout": 3}
+        result = dictExtract(source, "log_", pop=True, slice_prefix=False)
+        assert result == {"log_level": "INFO"}
+        assert source == {"timeout": 3}
+
 
 class TestMakeOpts:
     """Tests for make_opts helper."""
@@ -57,6 +86,16 @@ class TestMakeOpts:
         assert opts.tag == "default"
         assert opts.labels == ["x"]
 
+    def test_filter_function_combined_with_flags(self):
+        opts = make_opts(
+            {"timeout": None, "tag": "", "retries": 5, "debug": True},
+            {"timeout": 2, "tag": "default", "retries": 1},
+            filter_fn=lambda key, _: key != "debug",
+            ignore_none=True,
+            ignore_empty=True,
+        )
+        assert vars(opts) == {"timeout": 2, "tag": "default", "retries": 5}
+
     def test_accepts_missing_mappings(self):
         opts = make_opts(None, None)
         assert vars(opts) == {}